@@ -1,7 +1,15 @@
-from datetime import datetime, timedelta
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 import pyotp
-from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 # ------------------------------------------------------------------
@@ -16,11 +24,12 @@ except ImportError:
     SECRET_KEY = "dev-secret-change-me"
     ACCESS_TOKEN_EXPIRE_HOURS = 24
 
-ALGORITHM = "HS256"
 PENDING_2FA_TOKEN_EXPIRE_MINUTES = 5
 JWT_TYPE_ACCESS = "access"
 JWT_TYPE_PENDING_2FA = "pending_2fa"
 TOTP_ISSUER = "Pua'a"
+TOTP_INTERVAL = 30  # seconds; pyotp default, must match authenticator apps
+TOTP_DIGITS = 6
 
 # IMPORTANT:
 # Using pbkdf2_sha256 instead of bcrypt because bcrypt has
@@ -30,41 +39,142 @@ pwd_context = CryptContext(
     deprecated="auto"
 )
 
+# Hashes are computed with hashlib (OpenSSL) but written in passlib's
+# "$pbkdf2-sha256$rounds$salt$checksum" format, so existing hashes keep
+# verifying and pwd_context can still identify them (e.g. needs_update).
+_PBKDF2_PREFIX = "$pbkdf2-sha256$"
+_ITERS = 29000
+_SALT_LEN = 16
+_DK_LEN = 32
+
 # ------------------------------------------------------------------
 # Password hashing
 # ------------------------------------------------------------------
 
+def _ab64_encode(data: bytes) -> str:
+    """passlib's adapted base64: standard alphabet with '.' for '+', no padding."""
+    return base64.b64encode(data).decode("ascii").rstrip("=").replace("+", ".")
+
+
+def _ab64_decode(data: str) -> bytes:
+    data = data.replace(".", "+")
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    salt = os.urandom(_SALT_LEN)
+    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, _ITERS, _DK_LEN)
+    return f"{_PBKDF2_PREFIX}{_ITERS}${_ab64_encode(salt)}${_ab64_encode(dk)}"
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    if not password_hash.startswith(_PBKDF2_PREFIX):
+        return pwd_context.verify(password, password_hash)
+    try:
+        rounds, salt, checksum = password_hash[len(_PBKDF2_PREFIX):].split("$")
+        expected = _ab64_decode(checksum)
+        dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), _ab64_decode(salt), int(rounds), len(expected))
+    except ValueError:
+        return False
+    return hmac.compare_digest(dk, expected)
 
 
 # ------------------------------------------------------------------
 # JWT token helpers
 # ------------------------------------------------------------------
 
+# Tokens are always HS256 with this exact header, so its base64 form is fixed.
+# Decoding requires the same header bytes, which also rules out alg switching.
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _jwt_encode(claims: dict) -> str:
+    payload_b64 = _b64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = _JWT_HEADER_B64 + b"." + payload_b64
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url_encode(signature)).decode("ascii")
+
+
+def _jwt_decode(token: str) -> Optional[dict]:
+    """Verify signature and exp of an HS256 token; returns its claims or None."""
+    try:
+        parts = token.encode("ascii").split(b".")
+        if len(parts) != 3 or parts[0] != _JWT_HEADER_B64:
+            return None
+        expected = hmac.new(_SECRET_KEY_BYTES, parts[0] + b"." + parts[1], hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64url_decode(parts[2]), expected):
+            return None
+        claims = json.loads(_b64url_decode(parts[1]))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict):
+        return None
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        return None
+    return claims
+
+
+# Decoded-token LRUs: raw token -> (sub, exp). Clients reuse the same bearer
+# token for a whole session, so a hit skips the HS256 verify + JSON parse.
+_TOKEN_CACHE_MAX = 1024
+_token_cache: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+_pending_2fa_token_cache: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _cached_sub(cache: OrderedDict, token: str) -> Optional[str]:
+    """Return cached sub for token if present and not expired."""
+    with _token_cache_lock:
+        entry = cache.get(token)
+        if entry is None:
+            return None
+        sub, exp = entry
+        if exp <= time.time():
+            del cache[token]
+            return None
+        cache.move_to_end(token)
+        return sub
+
+
+def _cache_sub(cache: OrderedDict, token: str, sub: str, exp: float):
+    with _token_cache_lock:
+        cache[token] = (sub, exp)
+        cache.move_to_end(token)
+        if len(cache) > _TOKEN_CACHE_MAX:
+            cache.popitem(last=False)
+
+
 def create_access_token(subject: str) -> str:
-    expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     to_encode = {
         "sub": subject,
         "type": JWT_TYPE_ACCESS,
-        "exp": expire
+        "exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_HOURS * 3600
     }
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return _jwt_encode(to_encode)
 
 
 def decode_token(token: str) -> Optional[str]:
     """Decode access token; returns user_id (sub) or None. Rejects pending_2fa tokens."""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload.get("type") not in (None, JWT_TYPE_ACCESS):
-            return None
-        return payload.get("sub")
-    except JWTError:
+    sub = _cached_sub(_token_cache, token)
+    if sub is not None:
+        return sub
+    payload = _jwt_decode(token)
+    if payload is None or payload.get("type") not in (None, JWT_TYPE_ACCESS):
         return None
+    sub = payload.get("sub")
+    if sub:
+        _cache_sub(_token_cache, token, sub, payload["exp"])
+    return sub
 
 
 # ------------------------------------------------------------------
@@ -82,31 +192,51 @@ def get_totp_uri(secret: str, email: str) -> str:
     return totp.provisioning_uri(name=email, issuer_name=TOTP_ISSUER)
 
 
+def _hotp(key: bytes, counter: int) -> bytes:
+    """RFC 4226 HOTP (HMAC-SHA1, dynamic truncation) as ASCII digits."""
+    digest = hmac.new(key, struct.pack(">Q", counter), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    code = (int.from_bytes(digest[offset:offset + 4], "big") & 0x7FFFFFFF) % 10 ** TOTP_DIGITS
+    return f"{code:0{TOTP_DIGITS}d}".encode("ascii")
+
+
 def verify_totp(secret: str, code: str) -> bool:
     """Verify a 6-digit TOTP code (current or previous window for clock skew)."""
-    if not secret or not code or len(code) != 6:
+    if not secret or not code or len(code) != TOTP_DIGITS:
         return False
-    totp = pyotp.TOTP(secret)
-    return totp.verify(code, valid_window=1)
+    try:
+        # Same decoding as pyotp: pad to a multiple of 8, case-insensitive
+        key = base64.b32decode(secret + "=" * (-len(secret) % 8), casefold=True)
+    except (binascii.Error, ValueError):
+        return False
+    submitted = code.encode("utf-8")
+    counter = int(time.time()) // TOTP_INTERVAL
+    valid = False
+    # Check every window (no early exit) so timing doesn't reveal which one matched
+    for c in (counter - 1, counter, counter + 1):
+        valid |= hmac.compare_digest(_hotp(key, c), submitted)
+    return valid
 
 
 def create_pending_2fa_token(user_id: int) -> str:
     """Short-lived token used after password check when 2FA is required. Not a full access token."""
-    expire = datetime.utcnow() + timedelta(minutes=PENDING_2FA_TOKEN_EXPIRE_MINUTES)
     to_encode = {
         "sub": str(user_id),
         "type": JWT_TYPE_PENDING_2FA,
-        "exp": expire
+        "exp": int(time.time()) + PENDING_2FA_TOKEN_EXPIRE_MINUTES * 60
     }
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return _jwt_encode(to_encode)
 
 
 def decode_pending_2fa_token(token: str) -> Optional[str]:
     """Decode pending_2fa token; returns user_id (sub) or None."""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload.get("type") != JWT_TYPE_PENDING_2FA:
-            return None
-        return payload.get("sub")
-    except JWTError:
+    sub = _cached_sub(_pending_2fa_token_cache, token)
+    if sub is not None:
+        return sub
+    payload = _jwt_decode(token)
+    if payload is None or payload.get("type") != JWT_TYPE_PENDING_2FA:
         return None
+    sub = payload.get("sub")
+    if sub:
+        _cache_sub(_pending_2fa_token_cache, token, sub, payload["exp"])
+    return sub
@@ -3,7 +3,7 @@ Booking (Match) rules: no double booking, no overlapping date ranges, property c
 """
 
 from datetime import datetime
-from sqlmodel import Session, select
+from sqlmodel import Session, select, func
 from models import Match, Property
 
 
@@ -26,6 +26,26 @@ def get_concurrent_matches_for_property(
     return list(session.exec(stmt).all())
 
 
+def count_concurrent_matches_for_property(
+    session: Session,
+    property_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    exclude_match_id: int | None = None,
+) -> int:
+    """Count matches on this property that overlap [start_time, end_time] (served by ix_match_prop_range)."""
+    stmt = (
+        select(func.count())
+        .select_from(Match)
+        .where(Match.property_id == property_id)
+        .where(Match.start_time < end_time)
+        .where(Match.end_time > start_time)
+    )
+    if exclude_match_id is not None:
+        stmt = stmt.where(Match.id != exclude_match_id)
+    return session.exec(stmt).one()
+
+
 def can_create_booking(
     session: Session,
     property_id: int,
@@ -42,7 +62,9 @@ def can_create_booking(
     if not prop:
         return False, "Property not found"
 
-    overlapping = get_concurrent_matches_for_property(session, property_id, start_time, end_time)
-    if prop.max_hunters is not None and len(overlapping) >= prop.max_hunters:
+    if prop.max_hunters is None:
+        return True, ""
+    overlapping = count_concurrent_matches_for_property(session, property_id, start_time, end_time)
+    if overlapping >= prop.max_hunters:
         return False, f"Property allows at most {prop.max_hunters} concurrent hunter(s); this slot is full"
     return True, ""
@@ -1,32 +1,229 @@
 """
-Simple in-memory cache for property list and popular properties. TTL-based.
+Simple cache for property list and popular properties. TTL-based.
+L1 is an in-process dict; when REDIS_URL is set, Redis is used as a shared L2 so
+multiple workers share one warm cache. L1 entries then live at most L1_TTL_SECONDS,
+and invalidations are fanned out to every worker's L1 over Redis Pub/Sub.
 """
 
+import heapq
+import logging
+import pickle
+import threading
 import time
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
-# key -> (value, expiry_ts)
-_cache: dict[str, tuple[Any, float]] = {}
+try:
+    from config import config as _config
+    REDIS_URL = _config.REDIS_URL
+except ImportError:
+    REDIS_URL = ""
+
+logger = logging.getLogger("puaa.cache")
+
+# Max lifetime of an L1 entry when an L2 is configured (L1 TTL < L2 TTL)
+L1_TTL_SECONDS = 10
+# Pub/Sub channel carrying invalidated key prefixes between workers
+INVALIDATION_CHANNEL = "cache:invalidate"
+# L2 sorted set per namespace (e.g. cache_index:properties:): member = key, score = unix expiry.
+# invalidate_pattern reads it instead of SCANning the whole keyspace.
+INDEX_PREFIX = "cache_index:"
+
+
+class _Entry:
+    """Cache entry; expiry is on the time.monotonic() clock."""
+    __slots__ = ("value", "expiry")
+
+    def __init__(self, value: Any, expiry: float):
+        self.value = value
+        self.expiry = expiry
+
+
+# key -> _Entry
+_cache: dict[str, _Entry] = {}
+# (expiry, key) min-heap; swept lazily from set_ so expired keys don't pile up
+_expiry_heap: list[tuple[float, str]] = []
+# namespace (key up to and including the first ':') -> keys, for invalidate_pattern
+_by_prefix: dict[str, set[str]] = {}
+# Guards the structures above; sync endpoints run concurrently on the threadpool
+_mu = threading.Lock()
+# key -> lock held while that key is being loaded (see get_or_load)
+_locks: dict[str, threading.Lock] = {}
+_locks_mu = threading.Lock()
+
+_l2 = None
+if REDIS_URL:
+    try:
+        import redis
+    except ImportError:
+        raise RuntimeError("REDIS_URL is set but redis is not installed. Run: pip install redis")
+    _l2 = redis.Redis.from_url(REDIS_URL, decode_responses=False)
+# Background thread delivering INVALIDATION_CHANNEL messages (see start_invalidation_listener)
+_listener = None
+
+
+def _namespace(key: str) -> str:
+    i = key.find(":")
+    return key[: i + 1] if i >= 0 else ""
+
+
+def _delete(key: str):
+    _cache.pop(key, None)
+    keys = _by_prefix.get(_namespace(key))
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del _by_prefix[_namespace(key)]
+
+
+def _sweep(now: float):
+    """Evict entries whose expiry has passed. Heap entries for overwritten keys are skipped."""
+    while _expiry_heap and _expiry_heap[0][0] <= now:
+        expiry, key = heapq.heappop(_expiry_heap)
+        entry = _cache.get(key)
+        if entry is not None and entry.expiry == expiry:
+            _delete(key)
+
+
+def _l1_get(key: str) -> Optional[Any]:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() > entry.expiry:
+        with _mu:
+            if _cache.get(key) is entry:
+                _delete(key)
+        return None
+    return entry.value
+
+
+def _l1_set(key: str, value: Any, ttl_seconds: int):
+    now = time.monotonic()
+    expiry = now + ttl_seconds
+    with _mu:
+        _sweep(now)
+        _cache[key] = _Entry(value, expiry)
+        heapq.heappush(_expiry_heap, (expiry, key))
+        _by_prefix.setdefault(_namespace(key), set()).add(key)
+
+
+def _l1_invalidate(prefix: str):
+    ns = _namespace(prefix)
+    with _mu:
+        candidates = _by_prefix.get(ns, ()) if ns else _cache
+        to_del = [k for k in candidates if k.startswith(prefix)]
+        for k in to_del:
+            _delete(k)
+
+
+def _glob_escape(s: str) -> str:
+    """Escape Redis MATCH glob characters."""
+    for ch in "\\*?[]":
+        s = s.replace(ch, "\\" + ch)
+    return s
 
 
 def get(key: str) -> Optional[Any]:
     """Return cached value if present and not expired."""
-    if key not in _cache:
+    val = _l1_get(key)
+    if val is not None or _l2 is None:
+        return val
+    try:
+        raw = _l2.get(key)
+    except redis.RedisError:
+        logger.warning("event=cache_l2_error op=get key=%s", key, exc_info=True)
         return None
-    val, expiry = _cache[key]
-    if time.time() > expiry:
-        del _cache[key]
+    if raw is None:
         return None
+    val = pickle.loads(raw)
+    _l1_set(key, val, L1_TTL_SECONDS)
     return val
 
 
 def set_(key: str, value: Any, ttl_seconds: int):
     """Store value with TTL."""
-    _cache[key] = (value, time.time() + ttl_seconds)
+    if _l2 is None:
+        _l1_set(key, value, ttl_seconds)
+        return
+    _l1_set(key, value, min(ttl_seconds, L1_TTL_SECONDS))
+    now = time.time()
+    index = INDEX_PREFIX + _namespace(key)
+    try:
+        pipe = _l2.pipeline()
+        pipe.set(key, pickle.dumps(value), ex=ttl_seconds)
+        pipe.zadd(index, {key: now + ttl_seconds})
+        # Drop members whose keys have expired (cf. _sweep); Redis deletes the set once it is empty
+        pipe.zremrangebyscore(index, "-inf", now)
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("event=cache_l2_error op=set key=%s", key, exc_info=True)
 
 
 def invalidate_pattern(prefix: str):
     """Remove all keys starting with prefix (e.g. 'properties:')."""
-    to_del = [k for k in _cache if k.startswith(prefix)]
-    for k in to_del:
-        del _cache[k]
+    _l1_invalidate(prefix)
+    if _l2 is None:
+        return
+    ns = _namespace(prefix)
+    try:
+        if ns:
+            # Only this namespace's index is read: O(keys in namespace), not O(keyspace)
+            index = INDEX_PREFIX + ns
+            raw_prefix = prefix.encode()
+            keys = [k for k in _l2.zrange(index, 0, -1) if k.startswith(raw_prefix)]
+        else:
+            keys = list(_l2.scan_iter(match=_glob_escape(prefix) + "*", count=500))
+        pipe = _l2.pipeline()
+        if keys:
+            pipe.delete(*keys)
+            if ns:
+                pipe.zrem(index, *keys)
+        # Other workers drop the prefix from their L1 (we receive it too; harmless)
+        pipe.publish(INVALIDATION_CHANNEL, prefix.encode())
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("event=cache_l2_error op=invalidate prefix=%s", prefix, exc_info=True)
+
+
+def _on_invalidation(message: dict):
+    _l1_invalidate(message["data"].decode())
+
+
+def start_invalidation_listener():
+    """Subscribe to invalidations published by other workers. No-op without REDIS_URL."""
+    global _listener
+    if _l2 is None or _listener is not None:
+        return
+    pubsub = _l2.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(**{INVALIDATION_CHANNEL: _on_invalidation})
+    _listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+
+def stop_invalidation_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_or_load(key: str, loader: Callable[[], Any], ttl_seconds: int) -> Any:
+    """
+    Return cached value, or call loader() and cache its result.
+    Concurrent misses on the same key wait for a single loader call instead of
+    all hitting the database (cache stampede).
+    """
+    val = get(key)
+    if val is not None:
+        return val
+    with _locks_mu:
+        lock = _locks.setdefault(key, threading.Lock())
+    try:
+        with lock:
+            val = get(key)
+            if val is None:
+                val = loader()
+                set_(key, val, ttl_seconds)
+            return val
+    finally:
+        with _locks_mu:
+            if _locks.get(key) is lock and not lock.locked():
+                del _locks[key]
@@ -1,22 +1,16 @@
 """Clear all sightings and related data. Stop the backend server first if it's running."""
-from sqlmodel import Session, select
+from sqlalchemy import delete, update
+from sqlmodel import Session
 from db import engine
-from models import Sighting, AccessRequest, Message, Match
+from models import Property, Sighting, AccessRequest, Message, Match
 
 with Session(engine) as session:
-    msgs = list(session.exec(select(Message)))
-    reqs = list(session.exec(select(AccessRequest)))
-    matches = list(session.exec(select(Match)))
-    sightings = list(session.exec(select(Sighting)))
-
-    for m in msgs:
-        session.delete(m)
-    for r in reqs:
-        session.delete(r)
-    for m in matches:
-        session.delete(m)
-    for s in sightings:
-        session.delete(s)
+    # Children before parents (FK order); one DELETE per table, no rows loaded
+    cleared = {}
+    for model in (Message, AccessRequest, Match, Sighting):
+        cleared[model] = session.exec(delete(model)).rowcount
+    # Every match is gone, so no property has confirmed bookings any more
+    session.exec(update(Property).values(confirmed_bookings_count=0))
 
     session.commit()
-    print(f"Cleared: {len(sightings)} sightings, {len(reqs)} access requests, {len(msgs)} messages, {len(matches)} matches")
+    print(f"Cleared: {cleared[Sighting]} sightings, {cleared[AccessRequest]} access requests, {cleared[Message]} messages, {cleared[Match]} matches")
@@ -26,6 +26,19 @@ class Config:
         "sqlite:///./app.db" if ENV != "production" else "sqlite:///./app_production.db",
     )
 
+    # Connection pool (ignored for in-memory SQLite). DB_POOL_SIZE=0 disables pooling (e.g. behind pgbouncer).
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Seconds before a pooled connection is replaced (server databases only)
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+    # Report ORM lazy loads (N+1 candidates): "log" warns with the calling line, "raise" fails the
+    # request (use in tests/CI), empty disables. Off by default in production.
+    LAZY_LOAD_CHECK: str = os.getenv("LAZY_LOAD_CHECK", "" if IS_PRODUCTION else "log").lower()
+
+    # Max concurrent sync (def) endpoint calls per worker; anyio's default is 40
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "40"))
+
     # Auth (override in production via .env)
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-change-me")
     ACCESS_TOKEN_EXPIRE_HOURS: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_HOURS", "24"))
@@ -36,6 +49,18 @@ class Config:
     # Cache TTL for property list (seconds); 0 = disabled. Default 0 to avoid stale listings in development.
     CACHE_PROPERTIES_TTL: int = int(os.getenv("CACHE_PROPERTIES_TTL", "0"))
 
+    # Cache TTL for /matches/mine pages (seconds); 0 = disabled. Invalidated on booking approve/cancel.
+    CACHE_MATCHES_TTL: int = int(os.getenv("CACHE_MATCHES_TTL", "30"))
+
+    # Cache TTL for /stats/dashboard counts (seconds); 0 = disabled. Invalidated on writes that change them.
+    CACHE_STATS_TTL: int = int(os.getenv("CACHE_STATS_TTL", "60"))
+
+    # Cache TTL for the authenticated user row looked up on every request (seconds); 0 = disabled
+    CACHE_USER_TTL: int = int(os.getenv("CACHE_USER_TTL", "30"))
+
+    # Optional shared (L2) cache, e.g. redis://localhost:6379/0. Empty = in-process cache only.
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+
     # Pagination defaults
     DEFAULT_PAGE_SIZE: int = int(os.getenv("DEFAULT_PAGE_SIZE", "20"))
     MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "100"))
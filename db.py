@@ -1,78 +1,196 @@
-from sqlalchemy import text
+import logging
+import traceback
+
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql as postgresql_dialect, sqlite as sqlite_dialect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
 from sqlmodel import SQLModel, create_engine, Session
 
 try:
     from config import config
     DATABASE_URL = config.DATABASE_URL
+    DB_POOL_SIZE = config.DB_POOL_SIZE
+    DB_MAX_OVERFLOW = config.DB_MAX_OVERFLOW
+    DB_POOL_RECYCLE = config.DB_POOL_RECYCLE
+    LAZY_LOAD_CHECK = config.LAZY_LOAD_CHECK
 except ImportError:
     DATABASE_URL = "sqlite:///./app.db"
+    DB_POOL_SIZE = 20
+    DB_MAX_OVERFLOW = 10
+    DB_POOL_RECYCLE = 1800
+    LAZY_LOAD_CHECK = ""
+
+logger = logging.getLogger("puaa.db")
+
+_url = make_url(DATABASE_URL)
+_is_sqlite = _url.get_backend_name() == "sqlite"
+_engine_kwargs = {}
+if _is_sqlite:
+    # Sessions are opened on threadpool workers; pooled connections move between threads
+    _engine_kwargs["connect_args"] = {"check_same_thread": False}
+if _is_sqlite and _url.database in (None, "", ":memory:"):
+    pass  # In-memory SQLite uses a single-connection pool that takes no sizing
+elif DB_POOL_SIZE <= 0:
+    # No app-side pool, e.g. behind pgbouncer in transaction mode
+    _engine_kwargs["poolclass"] = NullPool
+else:
+    # LIFO reuses the warmest connections so idle extras can time out server-side
+    _engine_kwargs.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_use_lifo=True)
+    if not _is_sqlite:
+        # Drop connections the server or a proxy closed, and recycle before idle timeouts
+        _engine_kwargs.update(pool_pre_ping=True, pool_recycle=DB_POOL_RECYCLE)
+
+engine = create_engine(DATABASE_URL, echo=False, **_engine_kwargs)
+
+# Dialect INSERT with on_conflict_do_nothing()/returning(); SQLite and PostgreSQL share the API
+dialect_insert = (sqlite_dialect if _is_sqlite else postgresql_dialect).insert
+
+# WAL lets readers proceed during a write; NORMAL sync is durable under WAL except on power loss
+_SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-64000",
+)
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+        cursor = dbapi_conn.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+def _app_frame():
+    """Innermost stack frame outside installed libraries and this module: the line that touched the attribute."""
+    for frame in reversed(traceback.extract_stack()):
+        if "site-packages" not in frame.filename and frame.filename != __file__:
+            return frame
+    return None
+
+
+if LAZY_LOAD_CHECK in ("log", "raise"):
+    @event.listens_for(Session, "do_orm_execute")
+    def _report_lazy_load(orm_execute_state):
+        """Development aid: each lazy load is one query per parent row when it runs in a loop (N+1).
+        Eager loads (selectinload/joinedload) don't set lazy_loaded_from and pass silently."""
+        if not orm_execute_state.is_select or orm_execute_state.lazy_loaded_from is None:
+            return
+        attr = orm_execute_state.loader_strategy_path[-1]
+        frame = _app_frame()
+        where = f"{frame.filename}:{frame.lineno}" if frame else "?"
+        if LAZY_LOAD_CHECK == "raise":
+            raise RuntimeError(f"Lazy load of {attr} at {where}; eager-load it in the query")
+        logger.warning("event=lazy_load attr=%s at=%s", attr, where)
+
+
+# Columns added after a table first shipped: table -> [(column, SQL type)]
+_ADDED_COLUMNS = {
+    "user": [("totp_secret", "VARCHAR")],
+    "property": [
+        ("island", "VARCHAR"),
+        ("daily_rate", "FLOAT"),
+        ("max_hunters", "INTEGER"),
+        ("size_acres", "FLOAT"),
+        ("confirmed_bookings_count", "INTEGER NOT NULL DEFAULT 0"),
+    ],
+    "match": [
+        ("status", "VARCHAR DEFAULT 'confirmed'"),
+        ("start_time_epoch", "INTEGER NOT NULL DEFAULT 0"),
+    ],
+    "accessrequest": [("landowner_user_id", "INTEGER")],
+}
+
+# (table, column) -> UPDATE that fills a column from existing data right after it is added
+_BACKFILLS = {
+    ("accessrequest", "landowner_user_id"): (
+        "UPDATE accessrequest SET landowner_user_id = "
+        "(SELECT reported_by_user_id FROM sighting WHERE sighting.id = accessrequest.sighting_id)"
+    ),
+    ("property", "confirmed_bookings_count"): (
+        "UPDATE property SET confirmed_bookings_count = "
+        "(SELECT COUNT(*) FROM match WHERE match.property_id = property.id AND match.status = 'confirmed')"
+    ),
+    # start_time is stored as naive UTC text, which strftime('%s') reads as UTC
+    ("match", "start_time_epoch"): "UPDATE match SET start_time_epoch = CAST(strftime('%s', start_time) AS INTEGER)",
+}
+
+# Indexes that no query uses any more; dropped from existing databases
+_DROPPED_INDEXES = (
+    "ix_match_property_confirmed",  # popular properties now read Property.confirmed_bookings_count
+    # Single-column indexes now covered by a composite index with the same leading column
+    "ix_sighting_reported_by_user_id",  # ix_sighting_reporter_created
+    "ix_match_landowner_user_id",  # ix_match_landowner_status
+    "ix_match_hunter_user_id",  # ix_match_hunter_status
+    "ix_message_access_request_id",  # ix_message_request_id_id
+)
+
+_migrated = False
 
-engine = create_engine(DATABASE_URL, echo=False)
 
 def create_db_and_tables():
+    global _migrated
+    if _migrated:
+        return
     SQLModel.metadata.create_all(engine)
-    _add_totp_secret_column_if_missing()
-    _add_property_columns_if_missing()
-    _add_match_status_if_missing()
-    _add_message_table_if_missing()
-
-def _add_totp_secret_column_if_missing():
-    """Add totp_secret to user table for existing databases."""
-    with engine.connect() as conn:
-        result = conn.execute(
-            text("SELECT 1 FROM pragma_table_info('user') WHERE name='totp_secret'")
-        )
-        if result.fetchone() is None:
-            conn.execute(text("ALTER TABLE user ADD COLUMN totp_secret VARCHAR"))
-            conn.commit()
-
-
-def _add_property_columns_if_missing():
-    """Add island, daily_rate, max_hunters to property table for existing databases."""
-    with engine.connect() as conn:
-        for col, sql_type in [("island", "VARCHAR"), ("daily_rate", "FLOAT"), ("max_hunters", "INTEGER"), ("size_acres", "FLOAT")]:
-            result = conn.execute(
-                text("SELECT 1 FROM pragma_table_info('property') WHERE name=:name"),
-                {"name": col}
-            )
-            if result.fetchone() is None:
-                conn.execute(text(f"ALTER TABLE property ADD COLUMN {col} {sql_type}"))
-                conn.commit()
+    with engine.begin() as conn:
+        _add_columns_if_missing(conn)
+        _add_message_table_if_missing(conn)
+        _add_indexes_if_missing(conn)
+        _drop_unused_indexes(conn)
+    _migrated = True
 
 
-def _add_match_status_if_missing():
-    """Add status to match table for existing databases."""
-    with engine.connect() as conn:
-        result = conn.execute(
-            text("SELECT 1 FROM pragma_table_info('match') WHERE name='status'")
-        )
-        if result.fetchone() is None:
-            conn.execute(text("ALTER TABLE match ADD COLUMN status VARCHAR DEFAULT 'confirmed'"))
-            conn.commit()
+def _add_columns_if_missing(conn):
+    """Add _ADDED_COLUMNS to existing databases; reads each table's schema once.
+    Backfills run only after every column exists, since one may read another table's new column."""
+    added = []
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        for col, sql_type in columns:
+            if col not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {col} {sql_type}")
+                added.append((table, col))
+    for table_col in added:
+        if table_col in _BACKFILLS:
+            conn.exec_driver_sql(_BACKFILLS[table_col])
 
 
-def _add_message_table_if_missing():
+def _add_message_table_if_missing(conn):
     """Create message table for existing databases."""
-    with engine.connect() as conn:
-        result = conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='message'")
-        )
-        if result.fetchone() is None:
-            conn.execute(text("""
-                CREATE TABLE message (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
-                    access_request_id INTEGER NOT NULL,
-                    sender_user_id INTEGER NOT NULL,
-                    body VARCHAR(2000) NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(access_request_id) REFERENCES accessrequest(id)
-                )
-            """))
-            conn.execute(text("CREATE INDEX ix_message_access_request_id ON message(access_request_id)"))
-            conn.execute(text("CREATE INDEX ix_message_sender_user_id ON message(sender_user_id)"))
-            conn.commit()
+    result = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table' AND name='message'")
+    if result.fetchone() is None:
+        conn.execute(text("""
+            CREATE TABLE message (
+                id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                access_request_id INTEGER NOT NULL,
+                sender_user_id INTEGER NOT NULL,
+                body VARCHAR(2000) NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(access_request_id) REFERENCES accessrequest(id)
+            )
+        """))
+        conn.execute(text("CREATE INDEX ix_message_sender_user_id ON message(sender_user_id)"))
+
+
+def _add_indexes_if_missing(conn):
+    """Create model indexes (e.g. composite __table_args__ ones) missing from existing databases."""
+    existing = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='index'")}
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+
+
+def _drop_unused_indexes(conn):
+    for name in _DROPPED_INDEXES:
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
 
 
 def get_session():
-    with Session(engine) as session:
+    # Keep attributes loaded after commit: handlers serialise objects they just wrote,
+    # and expiring them would force a SELECT per object (all defaults are Python-side).
+    with Session(engine, expire_on_commit=False) as session:
         yield session
\ No newline at end of file
@@ -3,26 +3,61 @@ Structured logging: who booked what, when property created, failed logins.
 Uses standard logging; format is structured (key=value) for easy parsing.
 """
 
+import atexit
 import logging
+import queue
 import sys
 import time
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Background thread that writes queued records to stdout (see setup_logging)
+_listener: Optional[QueueListener] = None
+
 
 # One-time setup
 def setup_logging(level: str = "INFO"):
-    """Configure root logger with structured-style format (UTC)."""
+    """
+    Configure root logger with structured-style format (UTC).
+    Request threads only enqueue records; a QueueListener thread formats and writes them,
+    so handlers never block on stdout.
+    """
+    global _listener
     log_level = getattr(logging, level.upper(), logging.INFO)
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-        datefmt="%Y-%m-%dT%H:%M:%SZ",
-        stream=sys.stdout,
-    )
     logging.Formatter.converter = time.gmtime
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%SZ",
+    ))
+    if _listener is not None:
+        _listener.stop()
+    log_queue: queue.Queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(log_level)
+    root.handlers = [QueueHandler(log_queue)]
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+@atexit.register
+def _stop_listener():
+    """Flush queued records on interpreter exit."""
+    if _listener is not None:
+        _listener.stop()
+
+
+# (epoch second, formatted); timestamps have 1s resolution so format once per second
+_ts_cache: tuple[int, str] = (-1, "")
 
 
 def _ts() -> str:
-    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    global _ts_cache
+    sec = int(time.time())
+    cached = _ts_cache
+    if cached[0] != sec:
+        cached = _ts_cache = (sec, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec)))
+    return cached[1]
 
 
 logger = logging.getLogger("puaa")
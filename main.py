@@ -1,21 +1,34 @@
 import base64
+import hashlib
 import io
+import math
+import time
+import anyio.to_thread
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException, Header, Query, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, Header, Query, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from sqlmodel import Session, select, func
-from sqlalchemy import desc
-from datetime import datetime
+from sqlalchemy import delete, update, and_, or_
+from sqlalchemy.orm import joinedload, make_transient_to_detached, selectinload
 from typing import Optional, List
+import numpy as np
+import orjson
 import qrcode
 
-from db import create_db_and_tables, get_session
-from models import User, Property, Sighting, Subscription, AccessRequest, Match, Message
+from db import create_db_and_tables, get_session, dialect_insert
+from models import User, Property, Sighting, Subscription, AccessRequest, Match, Message, as_utc, epoch_seconds
 from config import config
 from logging_config import setup_logging, log_property_created, log_booking_created, log_booking_cancelled, log_login_failed, log_login_success
-from cache import get as cache_get, set_ as cache_set, invalidate_pattern as cache_invalidate
+from cache import (
+    get_or_load as cache_get_or_load,
+    invalidate_pattern as cache_invalidate,
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
 from tasks import send_booking_confirmation_mock, log_booking_analytics
 from auth import (
     hash_password,
@@ -28,7 +41,7 @@ from auth import (
     create_pending_2fa_token,
     decode_pending_2fa_token,
 )
-from matching import haversine_km, analyze_sighting
+from matching import haversine_km_batch, bounding_box, analyze_sighting, KM_PER_DEG_LAT, MAX_SUBSCRIPTION_RADIUS_KM
 from schemas import (
     RegisterRequest,
     LoginRequest,
@@ -44,6 +57,8 @@ from schemas import (
     RequestAccessBody,
     ApproveRequestBody,
     SendMessageBody,
+    ThreadItem,
+    MatchListItem,
     ErrorDetail,
 )
 from booking_rules import can_create_booking
@@ -59,7 +74,19 @@ async def lifespan(app: FastAPI):
             "2FA requires pyotp. Run: pip install pyotp qrcode[pil] (or pip install -r requirements.txt)"
         )
     create_db_and_tables()
+    # Sync endpoints run on anyio's worker threads; size that pool to the DB pool and workload
+    anyio.to_thread.current_default_thread_limiter().total_tokens = config.THREADPOOL_SIZE
+    start_invalidation_listener()
     yield
+    stop_invalidation_listener()
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (several times faster than json.dumps on large lists).
+    Defined here because fastapi.responses.ORJSONResponse is deprecated in recent FastAPI releases."""
+
+    def render(self, content) -> bytes:
+        return _json_body(content)
 
 
 app = FastAPI(
@@ -67,8 +94,27 @@ app = FastAPI(
     description="API for landowners to list properties and report pig sightings, and hunters to subscribe to areas and book access. Uses JWT auth and role-based access (landowner vs hunter).",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+class _GZipExceptPaths(GZipMiddleware):
+    """GZipMiddleware that passes the given request paths through uncompressed."""
+
+    def __init__(self, app, exclude_paths=(), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# List endpoints return repetitive JSON; compress anything over 1 KB. 2FA setup is mostly a
+# base64 PNG, which barely compresses, so it is sent as is.
+app.add_middleware(_GZipExceptPaths, exclude_paths=("/auth/2fa/setup",), minimum_size=1024, compresslevel=5)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -91,6 +137,16 @@ async def validation_exception_handler(request, exc: RequestValidationError):
     )
 
 
+def _json_body(content) -> bytes:
+    """Render JSON-ready content to compact UTF-8 JSON bytes. UTC datetimes end in "Z", as Pydantic writes them."""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def _property_list_body(props) -> bytes:
+    """PropertyResponse list rendered to JSON once, so cached hits skip validation and encoding."""
+    return _json_body(jsonable_encoder([PropertyResponse.model_validate(p) for p in props]))
+
+
 # ---------- Auth helpers ----------
 def get_current_user(
     session: Session = Depends(get_session),
@@ -98,30 +154,52 @@ def get_current_user(
 ) -> User:
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing Bearer token")
-    token = authorization.split(" ", 1)[1]
+    token = authorization[7:]  # len("Bearer ")
     sub = decode_token(token)
     if not sub:
         raise HTTPException(status_code=401, detail="Invalid token")
 
     # sub is user_id as string
-    user = session.get(User, int(sub))
+    user_id = int(sub)
+    if config.CACHE_USER_TTL <= 0:
+        user = session.get(User, user_id)
+    else:
+        # Column snapshot cached per user; re-attached to this session without a SELECT
+        data = cache_get_or_load(f"users:{user_id}:", lambda: _user_snapshot(session, user_id), config.CACHE_USER_TTL)
+        user = None
+        if data is not None:
+            user = User(**data)
+            make_transient_to_detached(user)
+            session.add(user)
+            # Secrets aren't in the snapshot; expired, they are SELECTed only if a handler reads them
+            session.expire(user, _UNCACHED_USER_FIELDS)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
 
+# Never cached: with REDIS_URL the snapshot is pickled into shared Redis
+_UNCACHED_USER_FIELDS = ["password_hash", "totp_secret"]
+
+def _user_snapshot(session: Session, user_id: int) -> Optional[dict]:
+    user = session.get(User, user_id)
+    return user.model_dump(exclude=set(_UNCACHED_USER_FIELDS)) if user else None
+
+def _invalidate_user(user: User):
+    """Call after changing a user's row so get_current_user stops serving the cached copy."""
+    cache_invalidate(f"users:{user.id}:")
+
 def require_role(user: User, role: str):
     if user.role != role:
         raise HTTPException(status_code=403, detail=f"Requires role: {role}")
 
 
-def _to_user_response(user: User):
-    """Pydantic v1 uses from_orm, v2 uses model_validate."""
-    if hasattr(UserResponse, "model_validate"):
-        return UserResponse.model_validate(user)
-    return UserResponse.from_orm(user)
+# Pydantic v1 uses from_orm, v2 uses model_validate; resolved once at import
+_to_user_response = UserResponse.model_validate if hasattr(UserResponse, "model_validate") else UserResponse.from_orm
 
 
 # ---------- Auth routes ----------
+_DUMMY_PASSWORD_HASH = hash_password("dummy-password-for-timing")
+
 @app.post(
     "/auth/register",
     response_model=None,
@@ -130,19 +208,33 @@ def _to_user_response(user: User):
     responses={400: {"description": "Invalid role or email already registered"}},
 )
 def register(payload: RegisterRequest, session: Session = Depends(get_session)):
-    existing = session.exec(select(User).where(User.email == payload.email)).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-
+    # Sync handler: FastAPI runs it on the threadpool, so neither PBKDF2 (which releases the GIL)
+    # nor a DB lock wait blocks the event loop
+    password_hash = hash_password(payload.password)
     user = User(
         name=payload.name,
         email=payload.email,
         role=payload.role,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
     )
-    session.add(user)
+    # Single round-trip, and the unique email index settles concurrent sign-ups
+    stmt = (
+        dialect_insert(User)
+        .values(
+            name=user.name,
+            email=user.email,
+            role=user.role,
+            password_hash=user.password_hash,
+            created_at=user.created_at,
+        )
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(User.id)
+    )
+    user.id = session.exec(stmt).scalar()
+    if user.id is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
     session.commit()
-    session.refresh(user)
+    cache_invalidate("stats:")
     token = create_access_token(str(user.id))
     return {"user": _to_user_response(user), "token": token}
 
@@ -155,7 +247,9 @@ def register(payload: RegisterRequest, session: Session = Depends(get_session)):
 )
 def login(payload: LoginRequest, session: Session = Depends(get_session)):
     user = session.exec(select(User).where(User.email == payload.email)).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+    # Unknown emails still pay for one hash check, so response time doesn't reveal which emails exist
+    password_hash = user.password_hash if user else _DUMMY_PASSWORD_HASH
+    if not verify_password(payload.password, password_hash) or not user:
         log_login_failed(payload.email)
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -204,7 +298,8 @@ def _qr_code_data_url(uri: str) -> str:
     img = qr.make_image(fill_color="black", back_color="white")
     buf = io.BytesIO()
     img.save(buf, format="PNG")
-    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+    # Encode straight from the buffer's memory rather than a getvalue() copy
+    return "data:image/png;base64," + base64.b64encode(buf.getbuffer()).decode("ascii")
 
 @app.post("/auth/2fa/setup")
 def setup_2fa(user: User = Depends(get_current_user)):
@@ -234,6 +329,7 @@ def confirm_2fa_setup(payload: Confirm2FASetupRequest, session: Session = Depend
     user.totp_secret = payload.secret
     session.add(user)
     session.commit()
+    _invalidate_user(user)
     return {"message": "2FA is now enabled"}
 
 @app.post(
@@ -248,6 +344,7 @@ def disable_2fa(payload: Disable2FARequest, session: Session = Depends(get_sessi
     user.totp_secret = None
     session.add(user)
     session.commit()
+    _invalidate_user(user)
     return {"message": "2FA has been disabled"}
 
 # ---------- Properties ----------
@@ -278,9 +375,9 @@ def create_property(
     )
     session.add(prop)
     session.commit()
-    session.refresh(prop)
     log_property_created(prop.id, user.id, prop.name)
     cache_invalidate("properties:")
+    cache_invalidate("stats:")
     return prop
 
 
@@ -291,6 +388,7 @@ def create_property(
     description="List properties. Optional: island, min_price, max_price, name, min_lat, max_lat, min_lng, max_lng, page, page_size. Cached when TTL set.",
 )
 def list_properties(
+    request: Request,
     session: Session = Depends(get_session),
     user: User = Depends(get_current_user),
     island: Optional[str] = Query(None),
@@ -305,34 +403,39 @@ def list_properties(
     page_size: int = Query(None, ge=1, le=config.MAX_PAGE_SIZE),
 ):
     page_size = page_size or config.DEFAULT_PAGE_SIZE
-    cache_key = f"properties:{island}:{min_price}:{max_price}:{name}:{min_lat}:{max_lat}:{min_lng}:{max_lng}:{page}:{page_size}"
-    if config.CACHE_PROPERTIES_TTL > 0:
-        cached = cache_get(cache_key)
-        if cached is not None:
-            return cached
-    stmt = select(Property)
-    if island is not None:
-        stmt = stmt.where(Property.island == island)
-    if min_price is not None:
-        stmt = stmt.where(Property.daily_rate >= min_price)
-    if max_price is not None:
-        stmt = stmt.where(Property.daily_rate <= max_price)
-    if name is not None and name.strip():
-        stmt = stmt.where(Property.name.contains(name.strip()))
-    if min_lat is not None:
-        stmt = stmt.where(Property.lat >= min_lat)
-    if max_lat is not None:
-        stmt = stmt.where(Property.lat <= max_lat)
-    if min_lng is not None:
-        stmt = stmt.where(Property.lng >= min_lng)
-    if max_lng is not None:
-        stmt = stmt.where(Property.lng <= max_lng)
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-    props = session.exec(stmt).all()
-    result = list(props)
+
+    def load():
+        stmt = select(Property)
+        if island is not None:
+            stmt = stmt.where(Property.island == island)
+        if min_price is not None:
+            stmt = stmt.where(Property.daily_rate >= min_price)
+        if max_price is not None:
+            stmt = stmt.where(Property.daily_rate <= max_price)
+        if name is not None and name.strip():
+            stmt = stmt.where(Property.name.contains(name.strip()))
+        if min_lat is not None:
+            stmt = stmt.where(Property.lat >= min_lat)
+        if max_lat is not None:
+            stmt = stmt.where(Property.lat <= max_lat)
+        if min_lng is not None:
+            stmt = stmt.where(Property.lng >= min_lng)
+        if max_lng is not None:
+            stmt = stmt.where(Property.lng <= max_lng)
+        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+        body = _property_list_body(session.exec(stmt).all())
+        return body, '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
     if config.CACHE_PROPERTIES_TTL > 0:
-        cache_set(cache_key, result, config.CACHE_PROPERTIES_TTL)
-    return result
+        cache_key = f"properties:{island}:{min_price}:{max_price}:{name}:{min_lat}:{max_lat}:{min_lng}:{max_lng}:{page}:{page_size}"
+        body, etag = cache_get_or_load(cache_key, load, config.CACHE_PROPERTIES_TTL)
+    else:
+        body, etag = load()
+    # Body is pre-rendered (and cached) JSON; a matching If-None-Match skips it entirely
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (t.strip() for t in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @app.get(
@@ -355,6 +458,35 @@ def list_my_properties(
     return list(props)
 
 
+@app.get(
+    "/properties/popular",
+    response_model=List[PropertyResponse],
+    summary="Popular properties",
+    description="Properties with most confirmed bookings. Cached. Optional limit.",
+)
+def list_popular_properties(
+    session: Session = Depends(get_session),
+    user: User = Depends(get_current_user),
+    limit: int = Query(10, ge=1, le=50),
+):
+
+    def load():
+        # Ranked by the maintained counter: one index-ordered read, no GROUP BY over match
+        stmt = (
+            select(Property)
+            .where(Property.confirmed_bookings_count > 0)
+            .order_by(Property.confirmed_bookings_count.desc(), Property.id)
+            .limit(limit)
+        )
+        return _property_list_body(session.exec(stmt).all())
+
+    if config.CACHE_PROPERTIES_TTL > 0:
+        body = cache_get_or_load(f"properties:popular:{limit}", load, config.CACHE_PROPERTIES_TTL)
+    else:
+        body = load()
+    return Response(content=body, media_type="application/json")
+
+
 @app.get(
     "/properties/{property_id}",
     response_model=PropertyResponse,
@@ -396,7 +528,7 @@ def update_property(
         setattr(prop, k, v)
     session.add(prop)
     session.commit()
-    session.refresh(prop)
+    cache_invalidate("properties:")
     return prop
 
 # ---------- Subscriptions ----------
@@ -422,7 +554,6 @@ def create_subscription(
     )
     session.add(sub)
     session.commit()
-    session.refresh(sub)
     return sub
 
 
@@ -449,7 +580,6 @@ def _get_or_create_default_property(session: Session, user: User, lat: float, ln
     prop = Property(owner_user_id=user.id, name="My Land", lat=lat, lng=lng, size_acres=size_acres)
     session.add(prop)
     session.commit()
-    session.refresh(prop)
     return prop
 
 
@@ -480,7 +610,7 @@ def create_sighting(
         reported_by_user_id=user.id,
         lat=payload.lat,
         lng=payload.lng,
-        seen_at=payload.seen_at,
+        seen_at=as_utc(payload.seen_at),
         count_estimate=payload.count_estimate,
         notes=payload.notes,
         credibility_score=ai["credibility_score"],
@@ -489,22 +619,46 @@ def create_sighting(
     )
     session.add(sighting)
     session.commit()
-    session.refresh(sighting)
     cache_invalidate("properties:")
+    cache_invalidate("stats:")
 
-    # Match to hunters with subscriptions within radius (these hunters get notified)
-    subs = session.exec(select(Subscription).where(Subscription.active == True)).all()
+    # Match to hunters with subscriptions within radius (these hunters get notified).
+    # Only subscriptions centred within the largest allowed radius can match, so
+    # pre-filter on that box in SQL and join the hunter in the same query.
+    min_lat, max_lat, min_lng, max_lng = bounding_box(sighting.lat, sighting.lng, MAX_SUBSCRIPTION_RADIUS_KM)
+    stmt = (
+        select(Subscription, User)
+        .join(User, User.id == Subscription.hunter_user_id)
+        .where(
+            Subscription.active == True,
+            Subscription.center_lat.between(min_lat, max_lat),
+            Subscription.center_lng.between(min_lng, max_lng),
+            User.role == "hunter",
+            # Each subscription's own box: reject far-away rows before any trig
+            func.abs(Subscription.center_lat - sighting.lat) <= Subscription.radius_km / KM_PER_DEG_LAT,
+        )
+    )
+    if (min_lng, max_lng) != (-180.0, 180.0):
+        # cos at the poleward edge of the outer box is a lower bound for every candidate,
+        # so radius / (111 * cos_min) never under-pads a subscription's longitude range
+        cos_min = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+        stmt = stmt.where(
+            func.abs(Subscription.center_lng - sighting.lng) <= Subscription.radius_km / (KM_PER_DEG_LAT * cos_min)
+        )
+    rows = session.exec(stmt).all()
     matches = []
-    for sub in subs:
-        d = haversine_km(sighting.lat, sighting.lng, sub.center_lat, sub.center_lng)
-        if d <= sub.radius_km:
-            hunter = session.get(User, sub.hunter_user_id)
-            if hunter and hunter.role == "hunter":
-                matches.append({
-                    "hunter_user_id": hunter.id,
-                    "hunter_name": hunter.name,
-                    "distance_km": round(d, 2),
-                })
+    if rows:
+        lats = np.fromiter((sub.center_lat for sub, _ in rows), dtype=np.float64, count=len(rows))
+        lngs = np.fromiter((sub.center_lng for sub, _ in rows), dtype=np.float64, count=len(rows))
+        radii = np.fromiter((sub.radius_km for sub, _ in rows), dtype=np.float64, count=len(rows))
+        dists = haversine_km_batch(sighting.lat, sighting.lng, lats, lngs)
+        for i in np.flatnonzero(dists <= radii):
+            hunter = rows[i][1]
+            matches.append({
+                "hunter_user_id": hunter.id,
+                "hunter_name": hunter.name,
+                "distance_km": round(float(dists[i]), 2),
+            })
 
     return {"sighting": sighting, "matched_hunters": matches}
 
@@ -541,22 +695,37 @@ def list_sightings_for_hunter(
     require_role(user, "hunter")
     page_size = page_size or config.DEFAULT_PAGE_SIZE
     subs = session.exec(select(Subscription).where(Subscription.hunter_user_id == user.id, Subscription.active == True)).all()
-    all_sightings = session.exec(
-        select(Sighting).where(Sighting.status == "open").order_by(Sighting.created_at.desc())
-    ).all()
+    stmt = select(Sighting).where(Sighting.status == "open").order_by(Sighting.created_at.desc())
     if not subs:
-        matched = list(all_sightings)
-    else:
-        matched = []
-        seen_ids = set()
-        for s in all_sightings:
-            if s.id in seen_ids:
-                continue
-            for sub in subs:
-                if haversine_km(s.lat, s.lng, sub.center_lat, sub.center_lng) <= sub.radius_km:
-                    seen_ids.add(s.id)
-                    matched.append(s)
-                    break
+        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+        return list(session.exec(stmt).all())
+    # Only sightings inside some subscription's bounding box can match; the exact
+    # radius check below still runs in Python, so pagination is applied after it
+    boxes = [bounding_box(sub.center_lat, sub.center_lng, sub.radius_km) for sub in subs]
+    stmt = stmt.where(or_(*(
+        and_(Sighting.lat.between(min_lat, max_lat), Sighting.lng.between(min_lng, max_lng))
+        for min_lat, max_lat, min_lng, max_lng in boxes
+    )))
+    c_lat = np.fromiter((sub.center_lat for sub in subs), dtype=np.float64, count=len(subs))
+    c_lng = np.fromiter((sub.center_lng for sub in subs), dtype=np.float64, count=len(subs))
+    rad = np.fromiter((sub.radius_km for sub in subs), dtype=np.float64, count=len(subs))
+    # Stream candidates in batches and stop once the requested page is filled
+    need = page * page_size
+    matched = []
+    result = session.exec(stmt.execution_options(yield_per=256))
+    try:
+        for batch in result.partitions():
+            # Pairwise (batch x subscriptions) distances in one vectorised pass;
+            # keep sightings inside any subscription's radius
+            s_lat = np.fromiter((s.lat for s in batch), dtype=np.float64, count=len(batch))
+            s_lng = np.fromiter((s.lng for s in batch), dtype=np.float64, count=len(batch))
+            d = haversine_km_batch(s_lat[:, None], s_lng[:, None], c_lat[None, :], c_lng[None, :])
+            mask = (d <= rad[None, :]).any(axis=1)
+            matched.extend(batch[i] for i in np.flatnonzero(mask))
+            if len(matched) >= need:
+                break
+    finally:
+        result.close()
     return matched[(page - 1) * page_size : page * page_size]
 
 @app.get(
@@ -593,13 +762,16 @@ def delete_sighting(
         raise HTTPException(status_code=404, detail="Sighting not found")
     if s.reported_by_user_id != user.id:
         raise HTTPException(status_code=403, detail="Not your sighting")
-    matches = session.exec(select(Match).where(Match.sighting_id == sighting_id)).all()
-    if matches:
+    has_bookings = session.exec(select(Match.id).where(Match.sighting_id == sighting_id).limit(1)).first()
+    if has_bookings is not None:
         raise HTTPException(status_code=400, detail="Cannot delete sighting with existing bookings")
-    for req in session.exec(select(AccessRequest).where(AccessRequest.sighting_id == sighting_id)).all():
-        session.delete(req)
+    # One DELETE for all of the sighting's requests (and their messages) instead of loading each row
+    req_ids = select(AccessRequest.id).where(AccessRequest.sighting_id == sighting_id)
+    session.exec(delete(Message).where(Message.access_request_id.in_(req_ids)))
+    session.exec(delete(AccessRequest).where(AccessRequest.sighting_id == sighting_id))
     session.delete(s)
     session.commit()
+    cache_invalidate("stats:")
     return None
 
 # ---------- Access requests ----------
@@ -621,10 +793,15 @@ def request_access(
     if not sighting:
         raise HTTPException(status_code=404, detail="Sighting not found")
 
-    req = AccessRequest(sighting_id=sighting_id, hunter_user_id=user.id, message=payload.message, status="pending")
+    req = AccessRequest(
+        sighting_id=sighting_id,
+        hunter_user_id=user.id,
+        landowner_user_id=sighting.reported_by_user_id,
+        message=payload.message,
+        status="pending",
+    )
     session.add(req)
     session.commit()
-    session.refresh(req)
     return req
 
 @app.get("/requests/incoming")
@@ -636,11 +813,12 @@ def incoming_requests(
 ):
     require_role(user, "landowner")
     page_size = page_size or config.DEFAULT_PAGE_SIZE
-    my_sightings = session.exec(select(Sighting).where(Sighting.reported_by_user_id == user.id)).all()
-    my_sighting_ids = [s.id for s in my_sightings]
-    if not my_sighting_ids:
-        return []
-    stmt = select(AccessRequest).where(AccessRequest.sighting_id.in_(my_sighting_ids)).offset((page - 1) * page_size).limit(page_size)
+    stmt = (
+        select(AccessRequest)
+        .where(AccessRequest.landowner_user_id == user.id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
     reqs = session.exec(stmt).all()
     return list(reqs)
 
@@ -658,21 +836,25 @@ def approve_request(
     user: User = Depends(get_current_user),
 ):
     require_role(user, "landowner")
-    req = session.get(AccessRequest, request_id)
-    if not req:
+    # Request, sighting, property and hunter in one round-trip (outer joins so a
+    # dangling sighting/property still yields 403 rather than 404)
+    row = session.exec(
+        select(AccessRequest, Sighting, Property, User)
+        .outerjoin(Sighting, Sighting.id == AccessRequest.sighting_id)
+        .outerjoin(Property, Property.id == Sighting.property_id)
+        .outerjoin(User, User.id == AccessRequest.hunter_user_id)
+        .where(AccessRequest.id == request_id)
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Request not found")
 
-    sighting = session.get(Sighting, req.sighting_id)
-    prop = session.get(Property, sighting.property_id) if sighting else None
+    req, sighting, prop, hunter = row
     if not sighting or not prop or prop.owner_user_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    start_time = payload.start_time
-    end_time = payload.end_time
-    if start_time.tzinfo:
-        start_time = start_time.replace(tzinfo=None)
-    if end_time.tzinfo:
-        end_time = end_time.replace(tzinfo=None)
+    # Aware UTC, like values read back through UTCDateTime; naive input is taken as UTC
+    start_time = as_utc(payload.start_time)
+    end_time = as_utc(payload.end_time)
 
     allowed, msg = can_create_booking(session, prop.id, start_time, end_time)
     if not allowed:
@@ -680,7 +862,6 @@ def approve_request(
 
     req.status = "approved"
     sighting.status = "closed"  # Remove from hunter map once approved
-    hunter = session.get(User, req.hunter_user_id)
     m = Match(
         sighting_id=sighting.id,
         property_id=prop.id,
@@ -688,21 +869,24 @@ def approve_request(
         hunter_user_id=req.hunter_user_id,
         start_time=start_time,
         end_time=end_time,
+        start_time_epoch=epoch_seconds(start_time),
         instructions=payload.instructions,
         status="confirmed",
     )
     session.add(req)
     session.add(m)
+    _adjust_confirmed_bookings(session, prop.id, 1)
     session.commit()
-    session.refresh(m)
     log_booking_created(m.id, prop.id, user.id, req.hunter_user_id, str(start_time), str(end_time))
     cache_invalidate("properties:")
+    cache_invalidate("stats:")
+    _invalidate_matches(m)
     background_tasks.add_task(
         send_booking_confirmation_mock,
         m.id, hunter.email if hunter else "", prop.name, str(start_time), str(end_time),
     )
     background_tasks.add_task(log_booking_analytics, m.id, prop.id, user.id, req.hunter_user_id)
-    return {"request": req, "match": m}
+    return {"request": req, "match": MatchListItem.model_validate(m)}
 
 @app.post(
     "/requests/{request_id}/reject",
@@ -751,35 +935,68 @@ def my_requests(
 
 
 # ---------- Messages (chat) ----------
-def _enrich_conversation(req, session: Session, user: User):
-    """Build conversation dict with other_user, sighting, property for display."""
-    sighting = session.get(Sighting, req.sighting_id)
-    prop = session.get(Property, sighting.property_id) if sighting else None
+def _require_conversation_party(req: AccessRequest, user: User):
+    """403 unless user is the request's landowner or hunter (by the user's role)."""
+    party_id = req.landowner_user_id if user.role == "landowner" else req.hunter_user_id
+    if party_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+
+def _conversation_load_options(user: User, strategy=selectinload) -> tuple:
+    """Eager loads for _enrich_conversations. selectinload: one IN query per relationship for a
+    whole page; joinedload: a single query, for one conversation."""
+    sighting = strategy(AccessRequest.sighting)
     if user.role == "landowner":
-        other = session.get(User, req.hunter_user_id)
-    else:
-        sighting_owner = session.get(User, sighting.reported_by_user_id) if sighting else None
-        other = sighting_owner
-    last_msg = (
-        session.exec(
-            select(Message)
-            .where(Message.access_request_id == req.id)
-            .order_by(Message.created_at.desc())
-            .limit(1)
-        ).first()
+        return (sighting.options(strategy(Sighting.property)), strategy(AccessRequest.hunter))
+    return (sighting.options(strategy(Sighting.property), strategy(Sighting.reporter)),)
+
+
+def _enrich_conversations(reqs, session: Session, user: User) -> list:
+    """Build conversation dicts with other_user, sighting, property for display.
+    Load reqs with _conversation_load_options(user) so relationships are already populated."""
+    if not reqs:
+        return []
+    # Latest message per request: ROW_NUMBER over each conversation, keep rn == 1
+    ranked = (
+        select(
+            Message.access_request_id,
+            Message.body,
+            Message.created_at,
+            func.row_number().over(
+                partition_by=Message.access_request_id,
+                order_by=(Message.created_at.desc(), Message.id.desc()),
+            ).label("rn"),
+        )
+        .where(Message.access_request_id.in_([r.id for r in reqs]))
+        .subquery()
     )
-    return {
-        "id": req.id,
-        "access_request_id": req.id,
-        "sighting_id": req.sighting_id,
-        "status": req.status,
-        "initial_message": req.message,
-        "created_at": req.created_at.isoformat() if req.created_at else None,
-        "other_user": {"id": other.id, "name": other.name} if other else None,
-        "property_name": (prop.name if prop else None) or f"Sighting #{req.sighting_id}",
-        "last_message": {"body": last_msg.body, "created_at": last_msg.created_at.isoformat()} if last_msg else None,
+    last_msgs = {
+        m.access_request_id: m
+        for m in session.exec(select(ranked.c.access_request_id, ranked.c.body, ranked.c.created_at).where(ranked.c.rn == 1)).all()
     }
 
+    out = []
+    for req in reqs:
+        sighting = req.sighting
+        prop = sighting.property if sighting else None
+        if user.role == "landowner":
+            other = req.hunter
+        else:
+            other = sighting.reporter if sighting else None
+        last_msg = last_msgs.get(req.id)
+        out.append({
+            "id": req.id,
+            "access_request_id": req.id,
+            "sighting_id": req.sighting_id,
+            "status": req.status,
+            "initial_message": req.message,
+            "created_at": req.created_at,
+            "other_user": {"id": other.id, "name": other.name} if other else None,
+            "property_name": (prop.name if prop else None) or f"Sighting #{req.sighting_id}",
+            "last_message": {"body": last_msg.body, "created_at": last_msg.created_at} if last_msg else None,
+        })
+    return out
+
 
 @app.get("/messages/conversations")
 def list_conversations(
@@ -791,13 +1008,9 @@ def list_conversations(
     """List chat conversations. Landowners see incoming requests; hunters see their outgoing requests."""
     page_size = page_size or config.DEFAULT_PAGE_SIZE
     if user.role == "landowner":
-        my_sightings = session.exec(select(Sighting).where(Sighting.reported_by_user_id == user.id)).all()
-        sighting_ids = [s.id for s in my_sightings]
-        if not sighting_ids:
-            return []
         stmt = (
             select(AccessRequest)
-            .where(AccessRequest.sighting_id.in_(sighting_ids))
+            .where(AccessRequest.landowner_user_id == user.id)
             .order_by(AccessRequest.created_at.desc())
         )
     else:
@@ -806,9 +1019,9 @@ def list_conversations(
             .where(AccessRequest.hunter_user_id == user.id)
             .order_by(AccessRequest.created_at.desc())
         )
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+    stmt = stmt.options(*_conversation_load_options(user)).offset((page - 1) * page_size).limit(page_size)
     reqs = session.exec(stmt).all()
-    return [_enrich_conversation(r, session, user) for r in reqs]
+    return ORJSONResponse(_enrich_conversations(reqs, session, user))
 
 
 @app.get("/messages/conversations/{request_id}")
@@ -816,45 +1029,38 @@ def get_conversation(
     request_id: int,
     session: Session = Depends(get_session),
     user: User = Depends(get_current_user),
+    after_id: Optional[int] = Query(None, ge=0, description="Return messages after this id (next_after_id of the previous page)"),
+    limit: int = Query(50, ge=1, le=config.MAX_PAGE_SIZE),
 ):
-    """Get full thread: request + follow-up messages."""
-    req = session.get(AccessRequest, request_id)
+    """Get thread: request + follow-up messages, oldest first, keyset-paginated by message id."""
+    # Request, sighting, property and other party in one query for _enrich_conversations
+    req = session.exec(
+        select(AccessRequest)
+        .where(AccessRequest.id == request_id)
+        .options(*_conversation_load_options(user, joinedload))
+    ).first()
     if not req:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    sighting = session.get(Sighting, req.sighting_id)
-    prop = session.get(Property, sighting.property_id) if sighting else None
-    if user.role == "landowner":
-        if not sighting or sighting.reported_by_user_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    else:
-        if req.hunter_user_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    other = session.get(User, req.hunter_user_id if user.role == "landowner" else sighting.reported_by_user_id)
-    messages = session.exec(
-        select(Message)
-        .where(Message.access_request_id == request_id)
-        .order_by(Message.created_at.asc())
-    ).all()
-    thread = []
-    if req.message:
-        thread.append({
-            "id": "initial",
-            "sender_user_id": req.hunter_user_id,
-            "body": req.message,
-            "created_at": req.created_at.isoformat() if req.created_at else None,
-        })
-    for m in messages:
-        thread.append({
-            "id": m.id,
-            "sender_user_id": m.sender_user_id,
-            "body": m.body,
-            "created_at": m.created_at.isoformat() if m.created_at else None,
-        })
-    return {
-        "conversation": _enrich_conversation(req, session, user),
+    _require_conversation_party(req, user)
+    conversation = _enrich_conversations([req], session, user)[0]
+    # Only the columns a ThreadItem needs: plain rows, no Message objects
+    stmt = select(Message.id, Message.sender_user_id, Message.body, Message.created_at).where(
+        Message.access_request_id == request_id
+    )
+    if after_id is not None:
+        stmt = stmt.where(Message.id > after_id)
+    # Seek on (access_request_id, id); stable while new messages are appended
+    rows = session.exec(stmt.order_by(Message.id.asc()).limit(limit)).all()
+    thread: List[ThreadItem] = []
+    if req.message and after_id is None:
+        thread.append(ThreadItem(id="initial", sender_user_id=req.hunter_user_id, body=req.message, created_at=req.created_at))
+    thread += [ThreadItem(id=i, sender_user_id=sender, body=body, created_at=at) for i, sender, body, at in rows]
+    return ORJSONResponse({
+        "conversation": conversation,
         "thread": thread,
-        "other_user": {"id": other.id, "name": other.name} if other else None,
-    }
+        "other_user": conversation["other_user"],
+        "next_after_id": rows[-1].id if len(rows) == limit else None,
+    })
 
 
 @app.delete(
@@ -872,15 +1078,8 @@ def delete_conversation(
     req = session.get(AccessRequest, request_id)
     if not req:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    sighting = session.get(Sighting, req.sighting_id)
-    if user.role == "landowner":
-        if not sighting or sighting.reported_by_user_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    else:
-        if req.hunter_user_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    for msg in session.exec(select(Message).where(Message.access_request_id == request_id)).all():
-        session.delete(msg)
+    _require_conversation_party(req, user)
+    session.exec(delete(Message).where(Message.access_request_id == request_id))
     session.delete(req)
     session.commit()
     return None
@@ -897,13 +1096,7 @@ def send_message(
     req = session.get(AccessRequest, request_id)
     if not req:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    sighting = session.get(Sighting, req.sighting_id)
-    if user.role == "landowner":
-        if not sighting or sighting.reported_by_user_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    else:
-        if req.hunter_user_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized")
+    _require_conversation_party(req, user)
     msg = Message(
         access_request_id=request_id,
         sender_user_id=user.id,
@@ -911,16 +1104,25 @@ def send_message(
     )
     session.add(msg)
     session.commit()
-    session.refresh(msg)
-    return {
-        "id": msg.id,
-        "sender_user_id": msg.sender_user_id,
-        "body": msg.body,
-        "created_at": msg.created_at.isoformat() if msg.created_at else None,
-    }
+    return ORJSONResponse(ThreadItem(id=msg.id, sender_user_id=msg.sender_user_id, body=msg.body, created_at=msg.created_at))
 
 
 # ---------- Matches ----------
+def _adjust_confirmed_bookings(session: Session, property_id: int, delta: int):
+    """Atomic in-database +/- on Property.confirmed_bookings_count (safe under concurrent approvals)."""
+    session.exec(
+        update(Property)
+        .where(Property.id == property_id)
+        .values(confirmed_bookings_count=Property.confirmed_bookings_count + delta)
+    )
+
+
+def _invalidate_matches(m: Match):
+    """Drop cached /matches/mine pages for both parties of a booking."""
+    cache_invalidate(f"matches:{m.landowner_user_id}:")
+    cache_invalidate(f"matches:{m.hunter_user_id}:")
+
+
 @app.get(
     "/matches/mine",
     summary="List my matches (bookings)",
@@ -934,16 +1136,27 @@ def list_my_matches(
     page_size: int = Query(None, ge=1, le=config.MAX_PAGE_SIZE),
 ):
     page_size = page_size or config.DEFAULT_PAGE_SIZE
-    stmt = select(Match)
-    if user.role == "landowner":
-        stmt = stmt.where(Match.landowner_user_id == user.id)
-    else:
-        stmt = stmt.where(Match.hunter_user_id == user.id)
-    if status:
-        stmt = stmt.where(Match.status == status)
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-    ms = session.exec(stmt).all()
-    return list(ms)
+
+    def load():
+        # Column projection: plain rows, no ORM objects or identity-map bookkeeping
+        stmt = select(
+            Match.id, Match.sighting_id, Match.property_id, Match.landowner_user_id, Match.hunter_user_id,
+            Match.start_time, Match.end_time, Match.instructions, Match.status, Match.created_at,
+        )
+        if user.role == "landowner":
+            stmt = stmt.where(Match.landowner_user_id == user.id)
+        else:
+            stmt = stmt.where(Match.hunter_user_id == user.id)
+        if status:
+            stmt = stmt.where(Match.status == status)
+        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+        return jsonable_encoder([MatchListItem(**row._mapping) for row in session.exec(stmt)])
+
+    if config.CACHE_MATCHES_TTL > 0:
+        # Per-user namespace so approve/cancel can drop every page and filter for both parties
+        cache_key = f"matches:{user.id}:{user.role}:{status}:{page}:{page_size}"
+        return cache_get_or_load(cache_key, load, config.CACHE_MATCHES_TTL)
+    return load()
 
 
 @app.post(
@@ -964,14 +1177,18 @@ def cancel_match(
         raise HTTPException(status_code=403, detail="Not authorized to cancel this booking")
     if m.status == "cancelled":
         raise HTTPException(status_code=400, detail="Booking is already cancelled")
-    if m.start_time < datetime.utcnow():
+    if m.start_time_epoch < int(time.time()):
         raise HTTPException(status_code=400, detail="Cannot cancel a booking that has already started or ended")
+    if m.status == "confirmed":
+        _adjust_confirmed_bookings(session, m.property_id, -1)
     m.status = "cancelled"
     session.add(m)
     session.commit()
     log_booking_cancelled(m.id, user.id)
     cache_invalidate("properties:")
-    return {"match": m, "message": "Booking cancelled"}
+    cache_invalidate("stats:")
+    _invalidate_matches(m)
+    return {"match": MatchListItem.model_validate(m), "message": "Booking cancelled"}
 
 
 # ---------- Stats ----------
@@ -981,51 +1198,24 @@ def cancel_match(
     description="Counts for properties, sightings, matches (bookings), users. For investors/demos.",
 )
 def stats_dashboard(session: Session = Depends(get_session), user: User = Depends(get_current_user)):
-    properties_count = session.exec(select(func.count(Property.id))).one()
-    sightings_count = session.exec(select(func.count(Sighting.id))).one()
-    matches_count = session.exec(select(func.count(Match.id)).where(Match.status == "confirmed")).one()
-    users_count = session.exec(select(func.count(User.id))).one()
-    return {
-        "properties": properties_count,
-        "sightings": sightings_count,
-        "confirmed_bookings": matches_count,
-        "users": users_count,
-    }
 
+    def load():
+        # Four scalar subqueries in a single SELECT: one round-trip instead of four
+        properties_count, sightings_count, matches_count, users_count = session.exec(
+            select(
+                select(func.count(Property.id)).scalar_subquery(),
+                select(func.count(Sighting.id)).scalar_subquery(),
+                select(func.count(Match.id)).where(Match.status == "confirmed").scalar_subquery(),
+                select(func.count(User.id)).scalar_subquery(),
+            )
+        ).one()
+        return {
+            "properties": properties_count,
+            "sightings": sightings_count,
+            "confirmed_bookings": matches_count,
+            "users": users_count,
+        }
 
-@app.get(
-    "/properties/popular",
-    response_model=List[PropertyResponse],
-    summary="Popular properties",
-    description="Properties with most confirmed bookings. Cached. Optional limit.",
-)
-def list_popular_properties(
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user),
-    limit: int = Query(10, ge=1, le=50),
-):
-    cache_key = f"properties:popular:{limit}"
-    if config.CACHE_PROPERTIES_TTL > 0:
-        cached = cache_get(cache_key)
-        if cached is not None:
-            return cached
-    # Property IDs with most confirmed matches, then fetch full Property rows
-    ids_stmt = (
-        select(Match.property_id, func.count(Match.id).label("c"))
-        .where(Match.status == "confirmed")
-        .group_by(Match.property_id)
-        .order_by(desc("c"))
-        .limit(limit)
-    )
-    rows = list(session.exec(ids_stmt).all())
-    ids = [r[0] for r in rows] if rows else []
-    if not ids:
-        if config.CACHE_PROPERTIES_TTL > 0:
-            cache_set(cache_key, [], config.CACHE_PROPERTIES_TTL)
-        return []
-    # Preserve order by match count (ids is already ordered)
-    props = [session.get(Property, pid) for pid in ids]
-    props = [p for p in props if p is not None]
-    if config.CACHE_PROPERTIES_TTL > 0:
-        cache_set(cache_key, props, config.CACHE_PROPERTIES_TTL)
-    return props
\ No newline at end of file
+    if config.CACHE_STATS_TTL > 0:
+        return cache_get_or_load("stats:dashboard", load, config.CACHE_STATS_TTL)
+    return load()
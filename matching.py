@@ -1,6 +1,12 @@
 import math
+import re
+import numpy as np
 from typing import List, Dict
 
+KM_PER_DEG_LAT = 111.0
+# Upper bound on Subscription.radius_km (see SubscriptionCreate validation)
+MAX_SUBSCRIPTION_RADIUS_KM = 500.0
+
 def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     # Earth radius in km
     R = 6371.0
@@ -12,6 +18,44 @@ def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     return R * c
 
+def haversine_km_batch(lat1, lon1, lats, lons) -> np.ndarray:
+    """
+    Vectorised haversine_km: distances in km between (lat1, lon1) and each (lats, lons).
+    Arguments are degrees and broadcast like NumPy arrays, so a column of sightings against
+    a row of centres gives the full pairwise matrix.
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lats)
+    dphi = phi2 - phi1
+    dlambda = np.radians(np.subtract(lons, lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> tuple[float, float, float, float]:
+    """
+    (min_lat, max_lat, min_lng, max_lng) enclosing every point within radius_km of (lat, lng).
+    Deliberately a little loose so it can pre-filter in SQL before the exact haversine check.
+    Falls back to the full longitude range near the poles or across the antimeridian.
+    """
+    dlat = radius_km / KM_PER_DEG_LAT
+    cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 90.0)))
+    dlng = dlat / cos_lat if cos_lat > 1e-6 else 180.0
+    if lng - dlng < -180.0 or lng + dlng > 180.0:
+        return lat - dlat, lat + dlat, -180.0, 180.0
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+# (pattern, tag, score delta) per rule, compiled once at import. Plain substring matches (no \b),
+# same as the original `w in text` checks, so e.g. "10" still matches inside "10am" and
+# "herd," with its punctuation still counts; that's why this isn't a token-set lookup.
+_RULES = tuple(
+    (re.compile("|".join(map(re.escape, words))), tag, delta)
+    for words, tag, delta in (
+        (("fresh", "just now", "right now", "minutes"), "fresh", 0.15),
+        (("herd", "group", "many", "8", "10", "dozen"), "multiple_pigs", 0.10),
+        (("damage", "rooting", "destroyed", "torn up"), "property_damage", 0.10),
+        (("maybe", "not sure", "think", "guess"), "uncertain", -0.15),
+    )
+)
+
 def analyze_sighting(notes: str | None) -> Dict:
     """
     Hackathon 'AI' stub. Replace with LLM call later.
@@ -22,18 +66,10 @@ def analyze_sighting(notes: str | None) -> Dict:
     tags = []
     score = 0.5
 
-    if any(w in text for w in ["fresh", "just now", "right now", "minutes"]):
-        tags.append("fresh")
-        score += 0.15
-    if any(w in text for w in ["herd", "group", "many", "8", "10", "dozen"]):
-        tags.append("multiple_pigs")
-        score += 0.10
-    if any(w in text for w in ["damage", "rooting", "destroyed", "torn up"]):
-        tags.append("property_damage")
-        score += 0.10
-    if any(w in text for w in ["maybe", "not sure", "think", "guess"]):
-        tags.append("uncertain")
-        score -= 0.15
+    for pat, tag, delta in _RULES:
+        if pat.search(text):
+            tags.append(tag)
+            score += delta
 
     score = max(0.0, min(1.0, score))
     summary = (notes or "Pig sighting reported.")[:160]
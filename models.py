@@ -1,11 +1,47 @@
 from typing import Optional, List, TYPE_CHECKING
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, Index
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import SQLModel, Field, Relationship
 
 if TYPE_CHECKING:
     pass  # Avoid circular import; relationships are optional for API
 
 
+def utcnow() -> datetime:
+    """Timezone-aware current UTC time (datetime.utcnow() is deprecated and naive)."""
+    return datetime.now(timezone.utc)
+
+
+def as_utc(dt: datetime) -> datetime:
+    """dt as an aware UTC datetime; naive input is taken to be UTC already."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def epoch_seconds(dt: datetime) -> int:
+    """Unix seconds for dt; naive datetimes are taken to be UTC, as stored in the database."""
+    return int(as_utc(dt).timestamp())
+
+
+class UTCDateTime(TypeDecorator):
+    """DateTime stored as naive UTC (SQLite keeps no offset) and read back as aware UTC,
+    so new and reloaded rows serialise the same way."""
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class User(SQLModel, table=True):
     """User: landowner or hunter. Owns properties (landowner) or subscriptions/matches (hunter)."""
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -14,13 +50,20 @@ class User(SQLModel, table=True):
     role: str  # "landowner" or "hunter"
     password_hash: str
     totp_secret: Optional[str] = None  # base32 secret for 2FA (TOTP)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow, sa_type=UTCDateTime)
 
     properties: List["Property"] = Relationship(back_populates="owner")
 
 
 class Property(SQLModel, table=True):
     """Property: owned by a landowner. Has sightings and matches (bookings)."""
+    __table_args__ = (
+        # lat/lng range filters in GET /properties
+        Index("ix_property_lat_lng", "lat", "lng"),
+        # /properties/popular: ORDER BY confirmed_bookings_count DESC LIMIT n
+        Index("ix_property_popular", "confirmed_bookings_count"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     owner_user_id: int = Field(index=True, foreign_key="user.id")
     name: str
@@ -31,19 +74,30 @@ class Property(SQLModel, table=True):
     daily_rate: Optional[float] = None  # Optional; for filtering
     max_hunters: Optional[int] = None   # Max concurrent hunters (booking capacity)
     size_acres: Optional[float] = None  # Property size in acres
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Matches with status "confirmed"; kept in step by approve/cancel (replaces a GROUP BY over match)
+    confirmed_bookings_count: int = 0
+    created_at: datetime = Field(default_factory=utcnow, sa_type=UTCDateTime)
 
     owner: Optional[User] = Relationship(back_populates="properties")
     sightings: List["Sighting"] = Relationship(back_populates="property")
     matches: List["Match"] = Relationship(back_populates="property")
 
 class Sighting(SQLModel, table=True):
+    __table_args__ = (
+        # Per-subscription bounding-box pre-filter in /sightings/for-hunter
+        Index("ix_sighting_status_lat_lng", "status", "lat", "lng"),
+        # /sightings/mine and the conversation join: filter by reporter, newest first
+        Index("ix_sighting_reporter_created", "reported_by_user_id", "created_at"),
+        # Open sightings newest first (/sightings/for-hunter)
+        Index("ix_sighting_status_created", "status", "created_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     property_id: int = Field(index=True, foreign_key="property.id")
-    reported_by_user_id: int = Field(index=True)
+    reported_by_user_id: int = Field(foreign_key="user.id")  # indexed via ix_sighting_reporter_created
     lat: float
     lng: float
-    seen_at: datetime
+    seen_at: datetime = Field(sa_type=UTCDateTime)
     count_estimate: Optional[int] = None
     notes: Optional[str] = None
     status: str = "open"  # open/closed
@@ -51,11 +105,17 @@ class Sighting(SQLModel, table=True):
     credibility_score: float = 0.5
     tags_csv: str = ""      # store tags as comma-separated string
     summary: str = ""
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow, sa_type=UTCDateTime)
 
     property: Optional["Property"] = Relationship(back_populates="sightings")
+    reporter: Optional[User] = Relationship()
 
 class Subscription(SQLModel, table=True):
+    __table_args__ = (
+        # Bounding-box pre-filter when matching a new sighting to subscriptions
+        Index("ix_subscription_active_center", "active", "center_lat", "center_lng"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     hunter_user_id: int = Field(index=True)
     center_lat: float
@@ -64,33 +124,59 @@ class Subscription(SQLModel, table=True):
     active: bool = True
 
 class AccessRequest(SQLModel, table=True):
+    __table_args__ = (
+        # Landowner inbox (/requests/incoming, conversations), newest first
+        Index("ix_accessrequest_landowner_created", "landowner_user_id", "created_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    sighting_id: int = Field(index=True)
-    hunter_user_id: int = Field(index=True)
+    sighting_id: int = Field(index=True, foreign_key="sighting.id")
+    hunter_user_id: int = Field(index=True, foreign_key="user.id")
+    # Copy of the sighting's reported_by_user_id, so authz and inbox queries skip the Sighting lookup
+    landowner_user_id: int = Field(foreign_key="user.id")
     message: Optional[str] = None
     status: str = "pending"  # pending/approved/rejected/cancelled
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow, sa_type=UTCDateTime)
+
+    sighting: Optional["Sighting"] = Relationship()
+    hunter: Optional[User] = Relationship(
+        sa_relationship_kwargs={"foreign_keys": "[AccessRequest.hunter_user_id]"}
+    )
 
 class Match(SQLModel, table=True):
     """Booking: landowner approved hunter access for a time window on a property."""
+    __table_args__ = (
+        # Overlap check in booking_rules: property_id = ? AND start_time < ? AND end_time > ?
+        Index("ix_match_prop_range", "property_id", "start_time", "end_time"),
+        # /matches/mine: filter by participant, optionally by status
+        Index("ix_match_landowner_status", "landowner_user_id", "status"),
+        Index("ix_match_hunter_status", "hunter_user_id", "status"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     sighting_id: int = Field(index=True, foreign_key="sighting.id")
     property_id: int = Field(index=True, foreign_key="property.id")
-    landowner_user_id: int = Field(index=True, foreign_key="user.id")
-    hunter_user_id: int = Field(index=True, foreign_key="user.id")
-    start_time: datetime
-    end_time: datetime
+    landowner_user_id: int = Field(foreign_key="user.id")  # indexed via ix_match_landowner_status
+    hunter_user_id: int = Field(foreign_key="user.id")  # indexed via ix_match_hunter_status
+    start_time: datetime = Field(sa_type=UTCDateTime)
+    end_time: datetime = Field(sa_type=UTCDateTime)
+    start_time_epoch: int = Field(default=0, index=True)  # epoch_seconds(start_time); cheap int comparisons
     instructions: Optional[str] = None
     status: str = "confirmed"  # confirmed | cancelled | completed
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow, sa_type=UTCDateTime)
 
     property: Optional["Property"] = Relationship(back_populates="matches")
 
 
 class Message(SQLModel, table=True):
     """Chat message within an access request thread (hunter <-> landowner)."""
+    __table_args__ = (
+        # Keyset pagination of a thread: access_request_id = ? AND id > ? ORDER BY id
+        Index("ix_message_request_id_id", "access_request_id", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    access_request_id: int = Field(index=True, foreign_key="accessrequest.id")
+    access_request_id: int = Field(foreign_key="accessrequest.id")  # indexed via ix_message_request_id_id
     sender_user_id: int = Field(index=True)
     body: str = Field(max_length=2000)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    created_at: datetime = Field(default_factory=utcnow, sa_type=UTCDateTime)
\ No newline at end of file
@@ -4,7 +4,7 @@ Validates email format, dates not in past, numbers > 0, role enum.
 """
 
 from datetime import datetime, timezone
-from typing import Optional, Literal
+from typing import Optional, Literal, TypedDict, Union
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 
 # ---------------------------------------------------------------------------
@@ -171,6 +171,15 @@ class SendMessageBody(BaseModel):
     body: str = Field(..., min_length=1, max_length=2000)
 
 
+class ThreadItem(TypedDict):
+    """One entry of a conversation thread. A plain dict encoded by orjson, so no validation per message.
+    id is "initial" for the access request's own message."""
+    id: Union[int, str]
+    sender_user_id: int
+    body: str
+    created_at: datetime
+
+
 class ApproveRequestBody(BaseModel):
     """Landowner: approve access with time window. Dates must be in future; end > start."""
     start_time: datetime
@@ -195,6 +204,28 @@ class ApproveRequestBody(BaseModel):
         return self
 
 
+# ---------------------------------------------------------------------------
+# Match (booking)
+# ---------------------------------------------------------------------------
+
+class MatchListItem(BaseModel):
+    """Booking in API responses: /matches/mine rows, approve and cancel. Leaves out internal
+    columns such as start_time_epoch."""
+    id: int
+    sighting_id: int
+    property_id: int
+    landowner_user_id: int
+    hunter_user_id: int
+    start_time: datetime
+    end_time: datetime
+    instructions: Optional[str] = None
+    status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 # ---------------------------------------------------------------------------
 # Query params for filtering
 # ---------------------------------------------------------------------------
@@ -31,6 +31,19 @@ async function handleResponse(res) {
   return data
 }
 
+// ---------- Dates ----------
+// The API stores UTC. datetime-local inputs give local wall-clock strings with no offset,
+// so convert them before sending; responses carry "Z" and new Date() shows them locally.
+export function toUtcIso(value) {
+  if (typeof value !== 'string' || /(Z|[+-]\d\d:\d\d)$/.test(value)) return value
+  return new Date(value).toISOString()
+}
+
+// Local wall-clock "YYYY-MM-DDTHH:mm" for a datetime-local input
+export function toLocalInputValue(date) {
+  return new Date(date.getTime() - date.getTimezoneOffset() * 60000).toISOString().slice(0, 16)
+}
+
 // ---------- Auth ----------
 export async function register({ name, email, password, role }) {
   const res = await fetch(`${BASE_URL}${API_PREFIX}/auth/register`, {
@@ -149,7 +162,7 @@ export async function createSighting(data) {
   const res = await fetch(`${BASE_URL}${API_PREFIX}/sightings`, {
     method: 'POST',
     headers: getHeaders(),
-    body: JSON.stringify(data),
+    body: JSON.stringify({ ...data, seen_at: toUtcIso(data.seen_at) }),
   })
   return handleResponse(res)
 }
@@ -205,7 +218,7 @@ export async function approveRequest(requestId, { start_time, end_time, instruct
   const res = await fetch(`${BASE_URL}${API_PREFIX}/requests/${requestId}/approve`, {
     method: 'POST',
     headers: getHeaders(),
-    body: JSON.stringify({ start_time: st, end_time: et, instructions: instructions ?? '' }),
+    body: JSON.stringify({ start_time: toUtcIso(st), end_time: toUtcIso(et), instructions: instructions ?? '' }),
   })
   return handleResponse(res)
 }
@@ -232,8 +245,17 @@ export async function listConversations(params = {}) {
 }
 
 export async function getConversation(requestId) {
-  const res = await fetch(`${BASE_URL}${API_PREFIX}/messages/conversations/${requestId}`, { headers: getHeaders() })
-  return handleResponse(res)
+  // The thread is keyset-paginated: follow next_after_id until the whole thread is loaded
+  let data = null
+  let afterId = null
+  do {
+    const q = new URLSearchParams(afterId == null ? {} : { after_id: afterId })
+    const res = await fetch(`${BASE_URL}${API_PREFIX}/messages/conversations/${requestId}?${q}`, { headers: getHeaders() })
+    const page = await handleResponse(res)
+    data = data ? { ...page, thread: [...data.thread, ...page.thread] } : page
+    afterId = page.next_after_id
+  } while (afterId != null)
+  return data
 }
 
 export async function sendMessage(requestId, { body }) {
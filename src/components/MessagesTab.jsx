@@ -5,10 +5,10 @@ import * as api from '../api'
 function defaultApproveDates() {
   const d = new Date()
   d.setDate(d.getDate() + 1)
-  const start = d.toISOString().slice(0, 16)
+  const start = api.toLocalInputValue(d)
   const e = new Date(d)
   e.setHours(17, 0, 0, 0)
-  return { start, end: e.toISOString().slice(0, 16) }
+  return { start, end: api.toLocalInputValue(e) }
 }
 
 function formatTime(iso) {
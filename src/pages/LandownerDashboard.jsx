@@ -249,7 +249,7 @@ export default function LandownerDashboard() {
                     />
                     <button
                       type="button"
-                      onClick={() => setAddSighting((s) => ({ ...s, seen_at: new Date().toISOString().slice(0, 16) }))}
+                      onClick={() => setAddSighting((s) => ({ ...s, seen_at: api.toLocalInputValue(new Date()) }))}
                       className="shrink-0 px-3 py-2 text-sm font-medium rounded-md border border-gray-200/80 bg-puaa-cream text-gray-700 hover:bg-puaa-cream/80 transition"
                     >
                       Now
@@ -4,7 +4,7 @@ FastAPI BackgroundTasks are used from main.py.
 """
 
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 
 logger = logging.getLogger("puaa.tasks")
 
@@ -22,5 +22,5 @@ def log_booking_analytics(match_id: int, property_id: int, landowner_id: int, hu
     """Log analytics event for booking (for dashboards, investors)."""
     logger.info(
         "event=booking_analytics match_id=%s property_id=%s landowner_id=%s hunter_id=%s at=%s",
-        match_id, property_id, landowner_id, hunter_id, datetime.utcnow().isoformat() + "Z",
+        match_id, property_id, landowner_id, hunter_id, datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
     )